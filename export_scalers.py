@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Export the StandardScaler parameters to models/scalers.npz
+The server only needs the means and scales, so it loads them from this file
+instead of unpickling the scikit-learn scalers. Run again after retraining.
+"""
+
+import joblib
+import numpy as np
+
+def main():
+    scaler_X = joblib.load('models/scaler_X.pkl')
+    scaler_y = joblib.load('models/scaler_y.pkl')
+    np.savez('models/scalers.npz',
+             x_mean=scaler_X.mean_, x_scale=scaler_X.scale_,
+             y_mean=scaler_y.mean_, y_scale=scaler_y.scale_)
+    print("✅ Scaler parameters written to models/scalers.npz")
+
+if __name__ == "__main__":
+    main()
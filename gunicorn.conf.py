@@ -0,0 +1,12 @@
+"""
+Gunicorn settings for the XGBoost weather prediction server
+Single-row XGBoost inference is dominated by serving overhead, so scale
+with one single-threaded worker per CPU core
+"""
+
+import multiprocessing
+
+bind = '0.0.0.0:5000'
+workers = multiprocessing.cpu_count()
+threads = 1
+preload_app = True
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """
 Serve the Weaza Nasa website with XGBoost model integration
+The model server hosts both the prediction API and the website files
 """
 
 import os
@@ -8,66 +9,63 @@ import sys
 import subprocess
 import threading
 import time
-from http.server import HTTPServer, SimpleHTTPRequestHandler
 import webbrowser
+from multiprocessing.connection import Listener
 
-def check_model_server():
-    """Check if the model server is running"""
-    import requests
-    try:
-        response = requests.get('http://localhost:5000/health', timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            return data.get('model_loaded', False)
-    except requests.exceptions.RequestException:
-        pass
-    return False
+def launch_model_server(listener):
+    """Start weather_model_server.py, which reports its startup status to listener"""
+    return subprocess.Popen([
+        sys.executable, 'weather_model_server.py',
+        '--ready-port', str(listener.address[1])
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)  # Request log is never read
+
+def wait_for_model_server(listener, process, timeout=30):
+    """Wait until the model server reports it is ready, exits, or the timeout expires"""
+    status = []
+    
+    def receive_status():
+        try:
+            with listener.accept() as conn:
+                status.append(conn.recv())
+        except (OSError, EOFError):
+            pass
+    
+    receiver = threading.Thread(target=receive_status, daemon=True)
+    receiver.start()
+    
+    # Stop waiting as soon as the server process dies without reporting
+    deadline = time.monotonic() + timeout
+    while receiver.is_alive() and process.poll() is None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        receiver.join(min(remaining, 0.1))
+    receiver.join(0.1)  # a status sent right before the process exited may still be in flight
+    return status == ['ready']
 
 def start_model_server():
     """Start the XGBoost model server in the background"""
     print("🚀 Starting XGBoost model server...")
     try:
-        # Start the model server
-        process = subprocess.Popen([
-            sys.executable, 'weather_model_server.py'
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        
-        # Wait for server to start
-        for i in range(30):  # Wait up to 30 seconds
-            if check_model_server():
+        with Listener(('localhost', 0)) as listener:
+            # Start the model server
+            process = launch_model_server(listener)
+            
+            # Wait up to 30 seconds for the server to report it is ready
+            if wait_for_model_server(listener, process):
                 print("✅ XGBoost model server is running!")
                 return process
-            time.sleep(1)
         
         print("❌ Failed to start model server")
+        process.terminate()
         return None
         
     except Exception as e:
         print(f"❌ Error starting model server: {e}")
         return None
 
-def start_website_server():
-    """Start the website server"""
-    print("🌐 Starting website server...")
-    
-    # Change to the website directory
-    website_dir = "weaza nasa"
-    if not os.path.exists(website_dir):
-        print(f"❌ Website directory '{website_dir}' not found!")
-        return None
-    
-    os.chdir(website_dir)
-    
-    # Start HTTP server
-    port = 8080
-    server_address = ('', port)
-    httpd = HTTPServer(server_address, SimpleHTTPRequestHandler)
-    
-    print(f"✅ Website server running at: http://localhost:{port}")
-    return httpd
-
 def main():
-    """Main function to start both servers"""
+    """Main function to start the server"""
     print("🌤️ Weaza Nasa Weather Prediction System")
     print("=" * 50)
     
@@ -76,6 +74,11 @@ def main():
         print("❌ Please run this script from the XGboost directory")
         return
     
+    # The website is served by the model server itself
+    if not os.path.exists("weaza nasa"):
+        print("❌ Website directory 'weaza nasa' not found!")
+        return
+    
     # Start model server
     model_process = start_model_server()
     if not model_process:
@@ -83,34 +86,26 @@ def main():
         return
     
     try:
-        # Start website server
-        website_server = start_website_server()
-        if not website_server:
-            return
-        
         # Open browser
         print("🌐 Opening website in browser...")
-        webbrowser.open('http://localhost:8080')
+        webbrowser.open('http://localhost:5000')
         
         print("\n" + "=" * 50)
-        print("🎉 Both servers are running!")
-        print("📍 Website: http://localhost:8080")
-        print("🤖 Model API: http://localhost:5000")
-        print("🛑 Press Ctrl+C to stop both servers")
+        print("🎉 Server is running!")
+        print("📍 Website: http://localhost:5000")
+        print("🤖 Model API: http://localhost:5000/predict")
+        print("🛑 Press Ctrl+C to stop the server")
         print("=" * 50)
         
-        # Start serving
-        website_server.serve_forever()
+        # Keep serving until the model server exits
+        model_process.wait()
         
     except KeyboardInterrupt:
-        print("\n👋 Shutting down servers...")
+        print("\n👋 Shutting down server...")
         
     finally:
         # Clean up
-        if model_process:
-            model_process.terminate()
-        if 'website_server' in locals():
-            website_server.shutdown()
+        model_process.terminate()
 
 if __name__ == "__main__":
     main()
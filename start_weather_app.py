@@ -7,10 +7,12 @@ This script handles all dependencies, model loading, and server startup
 import os
 import sys
 import subprocess
-import time
 import webbrowser
+from multiprocessing.connection import Listener
 from pathlib import Path
 
+from serve_website import launch_model_server, wait_for_model_server
+
 def check_python_version():
     """Check if Python version is compatible"""
     if sys.version_info < (3, 8):
@@ -36,8 +38,7 @@ def check_model_files():
     model_files = [
         'models/model_info.pkl',
         'models/xgb_model.json',
-        'models/scaler_X.pkl',
-        'models/scaler_y.pkl'
+        'models/scalers.npz'
     ]
     
     missing_files = []
@@ -78,65 +79,44 @@ def check_website_files():
     return True
 
 def start_servers():
-    """Start both model and website servers"""
+    """Start the model server, which also serves the website"""
     print("🚀 Starting servers...")
     
-    # Start model server
-    print("🤖 Starting XGBoost model server...")
-    model_process = subprocess.Popen([
-        sys.executable, 'weather_model_server.py'
-    ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    
-    # Wait for model server to start
-    print("⏳ Waiting for model server to start...")
-    for i in range(30):
-        try:
-            import requests
-            response = requests.get('http://localhost:5000/health', timeout=2)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('model_loaded', False):
-                    print("✅ Model server is running!")
-                    break
-        except:
-            pass
-        time.sleep(1)
-    else:
-        print("❌ Model server failed to start")
-        return False
-    
-    # Start website server
-    print("🌐 Starting website server...")
-    website_process = subprocess.Popen([
-        sys.executable, '-m', 'http.server', '8080'
-    ], cwd='weaza nasa', stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    
-    time.sleep(2)  # Give website server time to start
+    with Listener(('localhost', 0)) as listener:
+        # Start model server
+        print("🤖 Starting XGBoost model server...")
+        model_process = launch_model_server(listener)
+        
+        # Wait for model server to report it is ready
+        print("⏳ Waiting for model server to start...")
+        if not wait_for_model_server(listener, model_process):
+            print("❌ Model server failed to start")
+            model_process.terminate()
+            return False
+    print("✅ Model server is running!")
     
     print("\n" + "=" * 60)
     print("🎉 Weaza Nasa Weather Prediction System is running!")
     print("=" * 60)
-    print("📍 Website: http://localhost:8080")
-    print("🤖 Model API: http://localhost:5000")
-    print("🛑 Press Ctrl+C to stop both servers")
+    print("📍 Website: http://localhost:5000")
+    print("🤖 Model API: http://localhost:5000/predict")
+    print("🛑 Press Ctrl+C to stop the server")
     print("=" * 60)
     
     # Open browser
     try:
-        webbrowser.open('http://localhost:8080')
+        webbrowser.open('http://localhost:5000')
         print("🌐 Opening website in browser...")
     except:
         print("⚠️  Could not open browser automatically")
     
     try:
-        # Keep servers running
-        while True:
-            time.sleep(1)
+        # Keep server running
+        model_process.wait()
     except KeyboardInterrupt:
-        print("\n👋 Shutting down servers...")
+        print("\n👋 Shutting down server...")
         model_process.terminate()
-        website_process.terminate()
-        print("✅ Servers stopped")
+        print("✅ Server stopped")
 
 def main():
     """Main function"""
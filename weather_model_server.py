@@ -1,31 +1,69 @@
-from flask import Flask, request, jsonify
+import os
+# One OpenMP thread per process: scale out with workers, not threads.
+# Must be set before xgboost is imported (in load_model)
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+
+from flask import Flask, request
 from flask_cors import CORS
 import numpy as np
-import pandas as pd
-import joblib
-import xgboost as xgb
-from datetime import datetime
+import orjson
+try:
+    from numba import njit
+except ImportError:  # numba is optional: compute_derived then runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+from datetime import date, datetime
+from multiprocessing.connection import Client
+from werkzeug.serving import make_server
+import argparse
+import bisect
+import functools
+import math
+import threading
 import warnings
-import os
 warnings.filterwarnings('ignore')
 
-app = Flask(__name__)
+# Website files are served by the same process as the prediction API
+WEBSITE_DIR = 'weaza nasa'
+
+app = Flask(__name__, static_folder=WEBSITE_DIR, static_url_path='')
 CORS(app)  # Enable CORS for all routes
 
-# Global variables for model components
+# Global variables for model components (the prediction path itself uses the
+# components bound by make_predictor)
 xgb_model = None
-scaler_X = None
-scaler_y = None
 time_features = None
 target_columns = None
 
+# Model outputs read by convert_to_weather_states, in argument order, with the
+# value used when the model does not predict that target
+WEATHER_INPUTS = (
+    ('Tair_f_inst', 273.15), ('Qair_f_inst', 0.0), ('Psurf_f_inst', 101325.0),
+    ('U_f_inst', 0.0), ('V_f_inst', 0.0), ('Rainf_tavg', 0.0), ('Snowf_tavg', 0.0),
+    ('Albedo_inst', 0.0)
+)
+
+# Order in which predict_hour computes the time features
+FEATURE_ORDER = (
+    'day_of_year', 'month', 'year', 'day_of_week', 'is_weekend', 'hour',
+    'sin_day_of_year', 'cos_day_of_year', 'sin_month', 'cos_month',
+    'sin_day_of_week', 'cos_day_of_week', 'sin_hour', 'cos_hour'
+)
+
+# Upper bound on points per /predict_batch request
+MAX_BATCH_POINTS = 1000
+
 def load_model():
     """Load the trained XGBoost model and scalers"""
-    global xgb_model, scaler_X, scaler_y, time_features, target_columns
+    global xgb_model, time_features, target_columns, predict_weather, predict_weather_batch
     
     try:
+        # Heavy imports are deferred until the model is actually loaded
+        import joblib
+        import xgboost as xgb
+        
         # Check if model files exist
-        model_files = ['models/model_info.pkl', 'models/xgb_model.json', 'models/scaler_X.pkl', 'models/scaler_y.pkl']
+        model_files = ['models/model_info.pkl', 'models/xgb_model.json', 'models/scalers.npz']
         for file_path in model_files:
             if not os.path.exists(file_path):
                 print(f"❌ Model file not found: {file_path}")
@@ -35,6 +73,8 @@ def load_model():
         model_info = joblib.load('models/model_info.pkl')
         time_features = model_info['time_features']
         target_columns = model_info['target_columns']
+        # Column of each FEATURE_ORDER entry in the model input
+        feature_slots = [time_features.index(feat) for feat in FEATURE_ORDER]
         
         # Load XGBoost model
         xgb_model = xgb.XGBRegressor()
@@ -46,9 +86,42 @@ def load_model():
             if hasattr(xgb_model, param):
                 setattr(xgb_model, param, value)
         
-        # Load scalers
-        scaler_X = joblib.load('models/scaler_X.pkl')
-        scaler_y = joblib.load('models/scaler_y.pkl')
+        # Predict straight from the booster: no DMatrix per request, no OpenMP
+        # thread pool for single rows
+        booster = xgb_model.get_booster()
+        booster.set_param({'nthread': 1})
+        
+        # Load scaler parameters (exported from the StandardScalers by export_scalers.py)
+        with np.load('models/scalers.npz') as scalers:
+            x_mean = scalers['x_mean'].astype(np.float64)
+            x_inv_scale = 1.0 / scalers['x_scale']
+            scaler_y_mean = scalers['y_mean']
+            scaler_y_scale = scalers['y_scale']
+        
+        # Only un-scale the targets convert_to_weather_states reads. A missing
+        # target gets scale 0 and its default as mean, so it always evaluates
+        # to the default
+        output_slots, y_scale, y_mean = [], [], []
+        for name, default in WEATHER_INPUTS:
+            if name in target_columns:
+                i = target_columns.index(name)
+                output_slots.append(i)
+                y_scale.append(scaler_y_scale[i])
+                y_mean.append(scaler_y_mean[i])
+            else:
+                output_slots.append(0)
+                y_scale.append(0.0)
+                y_mean.append(default)
+        y_scale = np.array(y_scale, dtype=np.float64)
+        y_mean = np.array(y_mean, dtype=np.float64)
+        
+        # Compile (or load from numba's cache) the weather math before the first request
+        compute_derived(*(default for _, default in WEATHER_INPUTS))
+        
+        # Fresh predictors (with an empty prediction cache) for this model
+        predict_weather, predict_weather_batch = make_predictor(
+            booster, len(time_features), feature_slots,
+            x_mean, x_inv_scale, output_slots, y_scale, y_mean)
         
         print("XGBoost model loaded successfully!")
         print(f"Time features: {len(time_features)}")
@@ -59,147 +132,248 @@ def load_model():
         print(f"Error loading model: {e}")
         return False
 
+def parse_date(date_str):
+    """Parse an ISO 8601 date such as 'YYYY-MM-DDTHH:MM' (a trailing 'Z' is accepted)"""
+    if date_str.endswith('Z'):
+        date_str = date_str[:-1]
+    return datetime.fromisoformat(date_str)
+
+def make_predictor(booster, n_features, feature_slots, x_mean, x_inv_scale, output_slots, y_scale, y_mean):
+    """
+    Build predict_weather and predict_weather_batch for one loaded model
+    The model components are bound as closure variables, so the request path
+    does no global lookups and no model-loaded checks
+    """
+    # Per-thread input rows (raw float64 features, scaled float32 model input),
+    # reused across predictions
+    buffers = threading.local()
+    
+    def feature_buffers():
+        """Raw and scaled input rows of the calling thread, allocated on first use"""
+        X_input = getattr(buffers, 'X_input', None)
+        if X_input is None:
+            X_input = buffers.X_input = np.empty((1, n_features), dtype=np.float64)
+            buffers.X_scaled = np.empty((1, n_features), dtype=np.float32)
+        return X_input, buffers.X_scaled
+    
+    @functools.lru_cache(maxsize=8192)
+    def predict_hour(year, month, day, hour):
+        """
+        Model outputs for one hour, in WEATHER_INPUTS order
+        The time features do not resolve below the hour, so the result is cached per hour
+        """
+        day_date = date(year, month, day)
+        
+        # Day of year from ordinals (no struct_time built just for tm_yday)
+        day_of_year = day_date.toordinal() - date(year, 1, 1).toordinal() + 1
+        day_of_week = day_date.weekday()
+        
+        # Write time features and their cyclical encodings straight into the input row
+        # (math.sin/cos: for four angles the NumPy ufunc dispatch costs more than the math)
+        X_input, X_scaled = feature_buffers()
+        X_input[0, feature_slots] = (
+            day_of_year, month, year, day_of_week,
+            1 if day_of_week >= 5 else 0, hour,
+            math.sin(2 * math.pi * day_of_year / 366), math.cos(2 * math.pi * day_of_year / 366),
+            math.sin(2 * math.pi * month / 12), math.cos(2 * math.pi * month / 12),
+            math.sin(2 * math.pi * day_of_week / 7), math.cos(2 * math.pi * day_of_week / 7),
+            math.sin(2 * math.pi * hour / 24), math.cos(2 * math.pi * hour / 24)
+        )
+        
+        # Scale in float64, store as the float32 row XGBoost consumes
+        np.subtract(X_input, x_mean, out=X_input)
+        np.multiply(X_input, x_inv_scale, out=X_scaled)
+        
+        # Make prediction and undo the target scaling of the outputs in use
+        y_pred_scaled = booster.inplace_predict(X_scaled).reshape(1, -1)
+        y_pred = y_pred_scaled[0, output_slots] * y_scale + y_mean
+        
+        return tuple(y_pred.tolist())
+    
+    def predict_weather(date_str, lat, lon):
+        """
+        Predict weather for given date and coordinates using XGBoost model
+        """
+        try:
+            # Convert input to datetime
+            if isinstance(date_str, str):
+                time_dt = parse_date(date_str)
+            else:
+                time_dt = date_str
+            
+            # Make prediction (the model only sees the time, not the coordinates)
+            y_pred = predict_hour(time_dt.year, time_dt.month, time_dt.day, time_dt.hour)
+            
+            # Convert to user-friendly weather states
+            weather_data = convert_to_weather_states(*y_pred, lat, lon)
+            
+            return weather_data
+        
+        except Exception as e:
+            print(f"Error in prediction: {e}")
+            return None
+    
+    def predict_hours(time_dts):
+        """
+        Model outputs for many datetimes in one booster call
+        Returns an (N, len(WEATHER_INPUTS)) array, one row per datetime
+        """
+        fields = np.array([(t.toordinal() - date(t.year, 1, 1).toordinal() + 1,
+                            t.month, t.year, t.weekday(), t.hour)
+                           for t in time_dts], dtype=np.float64).reshape(-1, 5)
+        day_of_year, month, year, day_of_week, hour = fields.T
+        
+        # Fill the whole feature matrix column by column
+        X_input = np.empty((len(fields), n_features), dtype=np.float64)
+        X_input[:, feature_slots] = np.column_stack((
+            day_of_year, month, year, day_of_week, day_of_week >= 5, hour,
+            np.sin(2 * np.pi * day_of_year / 366), np.cos(2 * np.pi * day_of_year / 366),
+            np.sin(2 * np.pi * month / 12), np.cos(2 * np.pi * month / 12),
+            np.sin(2 * np.pi * day_of_week / 7), np.cos(2 * np.pi * day_of_week / 7),
+            np.sin(2 * np.pi * hour / 24), np.cos(2 * np.pi * hour / 24)
+        ))
+        X_scaled = ((X_input - x_mean) * x_inv_scale).astype(np.float32)
+        
+        # Make prediction and undo the target scaling of the outputs in use
+        y_pred_scaled = booster.inplace_predict(X_scaled).reshape(len(fields), -1)
+        return y_pred_scaled[:, output_slots] * y_scale + y_mean
+    
+    def predict_weather_batch(time_dts, coordinates):
+        """
+        Predict weather for many (datetime, (lat, lon)) pairs with a single model call
+        """
+        try:
+            y_pred = predict_hours(time_dts)
+            
+            # Convert each row to user-friendly weather states
+            return [convert_to_weather_states(*row, lat, lon)
+                    for row, (lat, lon) in zip(y_pred.tolist(), coordinates)]
+            
+        except Exception as e:
+            print(f"Error in batch prediction: {e}")
+            return None
+    
+    return predict_weather, predict_weather_batch
+
 def predict_weather(date_str, lat, lon):
     """
     Predict weather for given date and coordinates using XGBoost model
+    Replaced by load_model() with the predictor of the loaded model
     """
-    try:
-        # Validate model is loaded
-        if xgb_model is None or scaler_X is None or scaler_y is None:
-            print("Model not loaded")
-            return None
-        
-        # Convert input to datetime
-        if isinstance(date_str, str):
-            time_dt = pd.to_datetime(date_str)
-        else:
-            time_dt = date_str
-        
-        # Extract time features
-        features = {
-            'day_of_year': time_dt.timetuple().tm_yday,
-            'month': time_dt.month,
-            'year': time_dt.year,
-            'day_of_week': time_dt.weekday(),
-            'is_weekend': 1 if time_dt.weekday() in [5, 6] else 0,
-            'hour': time_dt.hour
-        }
-        
-        # Add cyclical encodings
-        features['sin_day_of_year'] = np.sin(2 * np.pi * features['day_of_year'] / 366)
-        features['cos_day_of_year'] = np.cos(2 * np.pi * features['day_of_year'] / 366)
-        features['sin_month'] = np.sin(2 * np.pi * features['month'] / 12)
-        features['cos_month'] = np.cos(2 * np.pi * features['month'] / 12)
-        features['sin_day_of_week'] = np.sin(2 * np.pi * features['day_of_week'] / 7)
-        features['cos_day_of_week'] = np.cos(2 * np.pi * features['day_of_week'] / 7)
-        features['sin_hour'] = np.sin(2 * np.pi * features['hour'] / 24)
-        features['cos_hour'] = np.cos(2 * np.pi * features['hour'] / 24)
-        
-        # Convert to array and scale
-        X_input = np.array([features[feat] for feat in time_features]).reshape(1, -1)
-        X_input_scaled = scaler_X.transform(X_input)
-        
-        # Make prediction
-        y_pred_scaled = xgb_model.predict(X_input_scaled)
-        y_pred = scaler_y.inverse_transform(y_pred_scaled)
-        
-        # Create result dictionary
-        raw_predictions = {}
-        for i, target_var in enumerate(target_columns):
-            raw_predictions[target_var] = float(y_pred[0, i])
-        
-        # Convert to user-friendly weather states
-        weather_data = convert_to_weather_states(raw_predictions, lat, lon)
-        
-        return weather_data
-        
-    except Exception as e:
-        print(f"Error in prediction: {e}")
-        return None
+    print("Model not loaded")
+    return None
 
-def convert_to_weather_states(raw_predictions, lat, lon):
+def predict_weather_batch(time_dts, coordinates):
     """
-    Convert raw model predictions to user-friendly weather states
+    Predict weather for many (datetime, (lat, lon)) pairs with a single model call
+    Replaced by load_model() with the predictor of the loaded model
+    """
+    print("Model not loaded")
+    return None
+
+@njit(cache=True)
+def truncate_rate(value):
+    """
+    int(value) for the probability formulas, identical compiled or not
+    Non-finite values raise ValueError (a compiled int() of NaN is undefined),
+    and values far outside 0-100 are bounded first so int() cannot overflow
+    """
+    if not math.isfinite(value):
+        raise ValueError("non-finite model output")
+    return int(min(1e4, max(-1e4, value)))
+
+@njit(cache=True)
+def compute_derived(temp_air, q, pressure_pa, u_wind, v_wind, rain_rate, snow_rate, albedo):
+    """
+    Derived weather quantities from the model outputs (WEATHER_INPUTS order)
     Using mathematical relationships from akhir haja.py
+    Returns (air temperature °C, pressure hPa, relative humidity %, heat index °C,
+    wind speed, wind gusts, wind chill °C, rain/snow/sunny/storm probabilities %)
+    Compiled to native code when numba is installed
     """
-    try:
-        # Extract variables from raw predictions
-        temp_air = raw_predictions.get('Tair_f_inst', 273.15)
-        temp_air_celsius = temp_air - 273.15
-        temp_air_kelvin = temp_air
-        
-        # Specific humidity (already in kg/kg, no conversion needed)
-        q_raw = raw_predictions.get('Qair_f_inst', 0.0)
-        q = q_raw  # keep in kg/kg
-        
-        # Surface pressure (convert from Pa to hPa)
-        pressure_pa = raw_predictions.get('Psurf_f_inst', 101325)
-        pressure_hpa = pressure_pa / 100
-        
-        # Wind components
-        u_wind = raw_predictions.get('U_f_inst', 0.0)
-        v_wind = raw_predictions.get('V_f_inst', 0.0)
-        wind_speed = np.sqrt(u_wind**2 + v_wind**2)
-        
-        # Precipitation rates
-        rain_rate = raw_predictions.get('Rainf_tavg', 0.0)
-        snow_rate = raw_predictions.get('Snowf_tavg', 0.0)
-        
-        # Albedo for cloud cover estimation
-        albedo = raw_predictions.get('Albedo_inst', 0.0)
-        
-        # === MATHEMATICAL RELATIONSHIPS FROM AKHIR HAJA.PY ===
-        
-        # 1. Relative Humidity calculation
-        # q is already in kg/kg
-        q_kg_kg = q
-        # Calculate vapor pressure
-        e = q_kg_kg * pressure_hpa / (0.622 + 0.378 * q_kg_kg)
-        # Calculate saturation vapor pressure
-        e_sat = np.exp(13.7 - (5120 / temp_air_kelvin))
-        # Relative humidity (%)
-        relative_humidity = 100 * e / e_sat if e_sat > 0 else 0
-        # Ensure humidity is within reasonable bounds
-        relative_humidity = min(100, max(0, relative_humidity))
-        
-        # 2. Heat Index calculation (only for temperatures >= 27°C)
+    temp_air_celsius = temp_air - 273.15
+    temp_air_kelvin = temp_air
+    
+    # Surface pressure (convert from Pa to hPa)
+    pressure_hpa = pressure_pa / 100
+    
+    # Wind components
+    wind_speed = math.sqrt(u_wind**2 + v_wind**2)
+    
+    # 1. Relative Humidity calculation
+    # q is already in kg/kg
+    # Calculate vapor pressure
+    e = q * pressure_hpa / (0.622 + 0.378 * q)
+    # Calculate saturation vapor pressure
+    e_sat = math.exp(13.7 - (5120 / temp_air_kelvin))
+    # Relative humidity (%)
+    relative_humidity = 100 * e / e_sat if e_sat > 0 else 0.0
+    # Ensure humidity is within reasonable bounds
+    relative_humidity = min(100.0, max(0.0, relative_humidity))
+    
+    # 2. Heat Index calculation (only for temperatures >= 27°C)
+    if temp_air_celsius >= 27:
         temp_fahrenheit = temp_air_celsius * 9/5 + 32
-        if temp_air_celsius >= 27:
-            heat_index_f = (-42.379 + 2.04901523*temp_fahrenheit + 10.14333127*relative_humidity 
-                          - 0.22475541*temp_fahrenheit*relative_humidity
-                          - 0.00683783*temp_fahrenheit**2 - 0.05481717*relative_humidity**2 
-                          + 0.00122874*temp_fahrenheit**2*relative_humidity
-                          + 0.00085282*temp_fahrenheit*relative_humidity**2 
-                          - 0.00000199*temp_fahrenheit**2*relative_humidity**2)
-            heat_index_celsius = (heat_index_f - 32) * 5/9
-        else:
-            heat_index_celsius = temp_air_celsius
-        
-        # 3. Wind gusts estimation
-        wind_gusts = wind_speed * 1.5
-        
-        # 4. Weather probabilities using mathematical relationships
-        rain_probability = min(100, max(0, int(rain_rate * 100)))
-        snow_probability = min(100, max(0, int(snow_rate * 100)))
-        sunny_probability = max(0, 100 - int(albedo * 10))
-        storm_probability = min(100, int(wind_speed * 10))
-        
-        # 5. Wind chill calculation (for cold temperatures)
-        if temp_air_celsius <= 10 and wind_speed >= 4.8:
-            wind_chill = 13.12 + 0.6215*temp_air_celsius - 11.37*(wind_speed**0.16) + 0.3965*temp_air_celsius*(wind_speed**0.16)
-        else:
-            wind_chill = temp_air_celsius
+        temp_f2 = temp_fahrenheit * temp_fahrenheit
+        humidity2 = relative_humidity * relative_humidity
+        heat_index_f = (-42.379 + 2.04901523*temp_fahrenheit + 10.14333127*relative_humidity 
+                      - 0.22475541*temp_fahrenheit*relative_humidity
+                      - 0.00683783*temp_f2 - 0.05481717*humidity2 
+                      + 0.00122874*temp_f2*relative_humidity
+                      + 0.00085282*temp_fahrenheit*humidity2 
+                      - 0.00000199*temp_f2*humidity2)
+        heat_index_celsius = (heat_index_f - 32) * 5/9
+    else:
+        heat_index_celsius = temp_air_celsius
+    
+    # 3. Wind gusts estimation
+    wind_gusts = wind_speed * 1.5
+    
+    # 4. Weather probabilities using mathematical relationships, all clamped
+    # to 0-100 (native min/max when compiled)
+    rain_probability = min(100, max(0, truncate_rate(rain_rate * 100)))
+    snow_probability = min(100, max(0, truncate_rate(snow_rate * 100)))
+    sunny_probability = min(100, max(0, 100 - truncate_rate(albedo * 10)))
+    storm_probability = min(100, max(0, truncate_rate(wind_speed * 10)))
+    
+    # 5. Wind chill calculation (for cold temperatures)
+    if temp_air_celsius <= 10 and wind_speed >= 4.8:
+        wind_factor = wind_speed**0.16
+        wind_chill = 13.12 + 0.6215*temp_air_celsius - 11.37*wind_factor + 0.3965*temp_air_celsius*wind_factor
+    else:
+        wind_chill = temp_air_celsius
+    
+    return (temp_air_celsius, pressure_hpa, relative_humidity, heat_index_celsius,
+            wind_speed, wind_gusts, wind_chill,
+            rain_probability, snow_probability, sunny_probability, storm_probability)
+
+def convert_to_weather_states(temp_air, q, pressure_pa, u_wind, v_wind, rain_rate, snow_rate, albedo, lat, lon):
+    """
+    Convert raw model predictions to user-friendly weather states
+    Model outputs are passed in WEATHER_INPUTS order: air temperature (K),
+    specific humidity (kg/kg), surface pressure (Pa), u/v wind (m/s),
+    rain and snow rates, albedo
+    """
+    try:
+        (temp_air_celsius, pressure_hpa, relative_humidity, heat_index_celsius,
+         wind_speed, wind_gusts, wind_chill,
+         rain_probability, snow_probability, sunny_probability, storm_probability) = compute_derived(
+            temp_air, q, pressure_pa, u_wind, v_wind, rain_rate, snow_rate, albedo)
+        
+        # Displayed values, rounded once even where they appear twice
+        feels_like = round(heat_index_celsius, 1)
+        wind_chill_display = round(wind_chill, 1)
         
         weather_states = {
             'location': {
                 'latitude': lat,
                 'longitude': lon,
-                'coordinates': f"{lat:.2f}°N, {lon:.2f}°E" if lon >= 0 else f"{lat:.2f}°N, {abs(lon):.2f}°W"
+                'coordinates': format_coordinates(lat, lon)
             },
             'temperature': {
                 'air_temperature': round(temp_air_celsius, 1),
-                'feels_like': round(heat_index_celsius, 1),
-                'wind_chill': round(wind_chill, 1),
+                'feels_like': feels_like,
+                'wind_chill': wind_chill_display,
                 'unit': '°C'
             },
             'precipitation': {
@@ -230,8 +404,8 @@ def convert_to_weather_states(raw_predictions, lat, lon):
                 'visibility': get_visibility_description(relative_humidity, rain_rate)
             },
             'comfort_index': {
-                'heat_index': round(heat_index_celsius, 1),
-                'wind_chill': round(wind_chill, 1),
+                'heat_index': feels_like,
+                'wind_chill': wind_chill_display,
                 'comfort_level': get_comfort_level(temp_air_celsius, relative_humidity, wind_speed)
             }
         }
@@ -242,44 +416,45 @@ def convert_to_weather_states(raw_predictions, lat, lon):
         print(f"Error converting weather states: {e}")
         return None
 
+def format_coordinates(lat, lon):
+    """Format coordinates for display, e.g. '40.71°N, 74.01°W'"""
+    return "%.2f°N, %.2f°%s" % (lat, abs(lon), "E" if lon >= 0 else "W")
+
+# Description tables: a value below THRESHOLDS[i] (and not below the previous
+# threshold) gets LABELS[i]; values above the last threshold get the last label
+WIND_THRESHOLDS = (0.5, 3.3, 5.5, 7.9, 10.7, 13.8)
+WIND_LABELS = ("Calm", "Light breeze", "Gentle breeze", "Moderate breeze",
+               "Fresh breeze", "Strong breeze", "High winds")
+HUMIDITY_THRESHOLDS = (30, 50, 70, 90)
+HUMIDITY_LABELS = ("Very dry", "Dry", "Comfortable", "Humid", "Very humid")
+PRESSURE_THRESHOLDS = (1000, 1020)
+PRESSURE_LABELS = ("Low pressure", "Normal pressure", "High pressure")
+# Visibility without rain: humidity above a threshold moves to the next label
+VISIBILITY_THRESHOLDS = (80, 90)
+VISIBILITY_LABELS = ("Good", "Fair", "Poor (fog)")
+# Comfort: rows by temperature band, columns by humidity band (<=70, <=80, >80)
+COMFORT_TEMP_THRESHOLDS = (0, 10, 20, 25, 30)
+COMFORT_HUMIDITY_THRESHOLDS = (70, 80)
+COMFORT_LEVELS = (
+    ("Very cold", "Very cold", "Very cold"),
+    ("Cold", "Cold", "Cold"),
+    ("Cool", "Cool", "Cool and humid"),
+    ("Pleasant", "Pleasant", "Warm and humid"),
+    ("Warm", "Hot and humid", "Hot and humid"),
+    ("Very hot", "Very hot", "Very hot")
+)
+
 def get_wind_description(speed):
     """Get wind description based on speed"""
-    if speed < 0.5:
-        return "Calm"
-    elif speed < 3.3:
-        return "Light breeze"
-    elif speed < 5.5:
-        return "Gentle breeze"
-    elif speed < 7.9:
-        return "Moderate breeze"
-    elif speed < 10.7:
-        return "Fresh breeze"
-    elif speed < 13.8:
-        return "Strong breeze"
-    else:
-        return "High winds"
+    return WIND_LABELS[bisect.bisect_right(WIND_THRESHOLDS, speed)]
 
 def get_humidity_description(humidity):
     """Get humidity description"""
-    if humidity < 30:
-        return "Very dry"
-    elif humidity < 50:
-        return "Dry"
-    elif humidity < 70:
-        return "Comfortable"
-    elif humidity < 90:
-        return "Humid"
-    else:
-        return "Very humid"
+    return HUMIDITY_LABELS[bisect.bisect_right(HUMIDITY_THRESHOLDS, humidity)]
 
 def get_pressure_description(pressure):
     """Get pressure description"""
-    if pressure < 1000:
-        return "Low pressure"
-    elif pressure < 1020:
-        return "Normal pressure"
-    else:
-        return "High pressure"
+    return PRESSURE_LABELS[bisect.bisect_right(PRESSURE_THRESHOLDS, pressure)]
 
 def get_primary_condition(rain_rate, snow_rate, temp):
     """Determine primary weather condition"""
@@ -311,12 +486,7 @@ def get_visibility_description(humidity, rain_rate):
     """Get visibility description"""
     if rain_rate > 0.01:
         return "Poor (rain)"
-    elif humidity > 90:
-        return "Poor (fog)"
-    elif humidity > 80:
-        return "Fair"
-    else:
-        return "Good"
+    return VISIBILITY_LABELS[bisect.bisect_left(VISIBILITY_THRESHOLDS, humidity)]
 
 def calculate_heat_index(temp, humidity):
     """Calculate heat index"""
@@ -331,32 +501,20 @@ def calculate_wind_chill(temp, wind_speed):
     if temp > 10 or wind_speed < 4.8:
         return temp
     # Simplified wind chill calculation
-    wc = 13.12 + 0.6215 * temp - 11.37 * (wind_speed ** 0.16) + 0.3965 * temp * (wind_speed ** 0.16)
+    wind_factor = wind_speed ** 0.16
+    wc = 13.12 + 0.6215 * temp - 11.37 * wind_factor + 0.3965 * temp * wind_factor
     return round(wc, 1)
 
 def get_comfort_level(temp, humidity, wind_speed):
     """Get comfort level description"""
-    if temp < 0:
-        return "Very cold"
-    elif temp < 10:
-        return "Cold"
-    elif temp < 20:
-        if humidity > 80:
-            return "Cool and humid"
-        else:
-            return "Cool"
-    elif temp < 25:
-        if humidity > 80:
-            return "Warm and humid"
-        else:
-            return "Pleasant"
-    elif temp < 30:
-        if humidity > 70:
-            return "Hot and humid"
-        else:
-            return "Warm"
-    else:
-        return "Very hot"
+    temp_band = bisect.bisect_right(COMFORT_TEMP_THRESHOLDS, temp)
+    humidity_band = bisect.bisect_left(COMFORT_HUMIDITY_THRESHOLDS, humidity)
+    return COMFORT_LEVELS[temp_band][humidity_band]
+
+def ojsonify(obj, status=200):
+    """JSON response serialized with orjson (NumPy scalars included)"""
+    return app.response_class(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+                              status=status, mimetype='application/json')
 
 @app.route('/predict', methods=['POST'])
 def predict():
@@ -366,7 +524,7 @@ def predict():
         
         # Validate input
         if not data or 'date' not in data or 'latitude' not in data or 'longitude' not in data:
-            return jsonify({'error': 'Missing required fields: date, latitude, longitude'}), 400
+            return ojsonify({'error': 'Missing required fields: date, latitude, longitude'}, 400)
         
         date = data['date']
         lat = float(data['latitude'])
@@ -374,47 +532,129 @@ def predict():
         
         # Validate coordinates
         if not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
-            return jsonify({'error': 'Invalid coordinates. Latitude must be between -90 and 90, longitude between -180 and 180'}), 400
+            return ojsonify({'error': 'Invalid coordinates. Latitude must be between -90 and 90, longitude between -180 and 180'}, 400)
         
         # Validate date format
         try:
-            pd.to_datetime(date)
-        except:
-            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DDTHH:MM format'}), 400
+            time_dt = parse_date(date)
+        except (AttributeError, ValueError):
+            return ojsonify({'error': 'Invalid date format. Use YYYY-MM-DDTHH:MM format'}, 400)
         
         # Make prediction
-        weather_data = predict_weather(date, lat, lon)
+        weather_data = predict_weather(time_dt, lat, lon)
         
         if weather_data is None:
-            return jsonify({'error': 'Failed to generate weather prediction'}), 500
+            return ojsonify({'error': 'Failed to generate weather prediction'}, 500)
         
-        return jsonify({
+        return ojsonify({
             'success': True,
             'data': weather_data
         })
         
     except ValueError as e:
-        return jsonify({'error': f'Invalid input: {str(e)}'}), 400
+        return ojsonify({'error': f'Invalid input: {str(e)}'}, 400)
     except Exception as e:
-        return jsonify({'error': f'Server error: {str(e)}'}), 500
+        return ojsonify({'error': f'Server error: {str(e)}'}, 500)
+
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    """API endpoint for weather prediction at many points in one request"""
+    try:
+        data = request.get_json()
+        
+        # Validate input
+        points = data.get('points') if isinstance(data, dict) else None
+        if not isinstance(points, list) or not points:
+            return ojsonify({'error': 'Missing required field: points (list of {date, latitude, longitude})'}, 400)
+        if len(points) > MAX_BATCH_POINTS:
+            return ojsonify({'error': f'Too many points. At most {MAX_BATCH_POINTS} per request'}, 400)
+        
+        time_dts = []
+        coordinates = []
+        for i, point in enumerate(points):
+            if not isinstance(point, dict) or 'date' not in point or 'latitude' not in point or 'longitude' not in point:
+                return ojsonify({'error': f'Point {i}: missing required fields: date, latitude, longitude'}, 400)
+            
+            lat = float(point['latitude'])
+            lon = float(point['longitude'])
+            
+            # Validate coordinates
+            if not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
+                return ojsonify({'error': f'Point {i}: invalid coordinates. Latitude must be between -90 and 90, longitude between -180 and 180'}, 400)
+            
+            # Validate date format
+            try:
+                time_dts.append(parse_date(point['date']))
+            except (AttributeError, ValueError):
+                return ojsonify({'error': f'Point {i}: invalid date format. Use YYYY-MM-DDTHH:MM format'}, 400)
+            coordinates.append((lat, lon))
+        
+        # Make predictions
+        weather_data = predict_weather_batch(time_dts, coordinates)
+        
+        if weather_data is None or any(item is None for item in weather_data):
+            return ojsonify({'error': 'Failed to generate weather prediction'}, 500)
+        
+        return ojsonify({
+            'success': True,
+            'data': weather_data
+        })
+        
+    except ValueError as e:
+        return ojsonify({'error': f'Invalid input: {str(e)}'}, 400)
+    except Exception as e:
+        return ojsonify({'error': f'Server error: {str(e)}'}, 500)
+
+@app.route('/')
+def index():
+    """Serve the website entry page"""
+    return app.send_static_file('index.html')
 
 @app.route('/health')
 def health():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'model_loaded': xgb_model is not None})
+    return ojsonify({'status': 'healthy', 'model_loaded': xgb_model is not None})
+
+def notify_ready(port, status):
+    """Report startup status to the launcher script listening on port"""
+    try:
+        with Client(('localhost', port)) as conn:
+            conn.send(status)
+    except OSError as e:
+        print(f"Could not notify launcher: {e}")
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='XGBoost Weather Prediction Server')
+    parser.add_argument('--ready-port', type=int,
+                        help='port of the launcher waiting for the startup status')
+    args = parser.parse_args()
+    
     # Load model on startup
     if load_model():
         print("Starting XGBoost Weather Prediction Server...")
+        # Bind before signalling so the launcher never sees a closed port
+        try:
+            server = make_server('0.0.0.0', 5000, app, threaded=True)
+        except OSError as e:
+            print(f"Could not start server on port 5000: {e}")
+            if args.ready_port:
+                notify_ready(args.ready_port, 'failed')
+            raise SystemExit(1)
+        if args.ready_port:
+            notify_ready(args.ready_port, 'ready')
         print("Server will be available at: http://localhost:5000")
+        print(f"Website served from '{WEBSITE_DIR}' at: http://localhost:5000")
         print("Press Ctrl+C to stop the server")
-        app.run(debug=False, host='0.0.0.0', port=5000)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
     else:
+        if args.ready_port:
+            notify_ready(args.ready_port, 'failed')
         print("Failed to load model. Please check model files.")
         print("Make sure these files exist:")
         print("   - models/model_info.pkl")
         print("   - models/xgb_model.json") 
-        print("   - models/scaler_X.pkl")
-        print("   - models/scaler_y.pkl")
+        print("   - models/scalers.npz (run export_scalers.py)")
 
@@ -0,0 +1,11 @@
+"""
+WSGI entry point for production serving with gunicorn:
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from weather_model_server import app, load_model
+
+# Load at import so the gunicorn master (preload_app) loads the model once
+# and every forked worker starts warm
+if not load_model():
+    raise RuntimeError("Failed to load model. Please check model files.")